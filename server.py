@@ -5,30 +5,122 @@ A self-contained tool to run training scripts via a web interface with byobu ter
 """
 
 import os
+import stat
 import sys
 import ast
 import re
 import subprocess
-import json
+import shlex
+import tempfile
+try:
+    import orjson
+except ImportError:  # Fall back to the (slower) standard library encoder
+    orjson = None
+    import json
+import msgspec
+import mmap
 import argparse
+import functools
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, render_template, request, send_from_directory
 from flask_cors import CORS
+from werkzeug.exceptions import BadRequest
 import threading
+import queue
+import atexit
 import time
 from datetime import datetime
 import errno
+import logging
 
 app = Flask(__name__, static_folder='static', template_folder='templates')
 CORS(app)
 
+def json_dumps(obj, indent=False):
+    """Serialize obj to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def json_loads(data):
+    """Parse JSON from bytes or str, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def request_json():
+    """
+    Parse the JSON body of the current request (replaces request.json).
+    Reads the raw body without caching it on the request and decodes it in one pass.
+    """
+    try:
+        return json_loads(request.get_data(cache=False))
+    except ValueError as e:
+        raise BadRequest(f'Failed to decode JSON object: {e}')
+
+def json_response(obj, status=200):
+    """Build a JSON response (drop-in for jsonify)."""
+    return app.response_class(json_dumps(obj), status=status, mimetype='application/json')
+
+# Process umask, read once at startup (os.umask() can only be queried by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def stat_etag(st):
+    """ETag value for a file's contents, from its inode, mtime and size."""
+    return f'{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}'
+
+def with_etag(response, etag):
+    """Tag response with a weak ETag; no-cache makes the browser revalidate before reuse."""
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def not_modified(etag):
+    """Return a 304 response if the client already holds etag, else None."""
+    if request.if_none_match.contains_weak(etag):
+        return with_etag(app.response_class(status=304), etag)
+    return None
+
+def write_json_file(path, obj):
+    """
+    Serialize obj to indented JSON and write it to path in a single write.
+    The data goes to a temporary file that is renamed over path, so readers
+    never see a partially written file.
+    """
+    # A unique temporary name per write, so concurrent saves of the same file
+    # cannot clobber each other's half-written data
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        # The file object owns fd from here on, so every failure below closes it
+        with os.fdopen(fd, 'wb', buffering=65536) as f:
+            # mkstemp creates 0600; keep the replaced file's mode, or what open() would give
+            try:
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+            except FileNotFoundError:
+                mode = 0o666 & ~_UMASK
+            os.fchmod(f.fileno(), mode)
+            f.write(json_dumps(obj, indent=True))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
 # Global configuration - Organized data directory structure
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 CONFIG_FILE = os.path.join(DATA_DIR, 'config.json')
 CONFIGS_DIR = os.path.join(DATA_DIR, 'configs')
 ARGS_PRESETS_DIR = os.path.join(DATA_DIR, 'arg_presets')
 HISTORY_DIR = os.path.join(DATA_DIR, 'history')
-HISTORY_FILE = os.path.join(HISTORY_DIR, 'command_history.json')
+HISTORY_FILE = os.path.join(HISTORY_DIR, 'command_history.mpk')
+# JSON array (newest first) used before the append-only history format
+LEGACY_HISTORY_FILE = os.path.join(HISTORY_DIR, 'command_history.json')
+HISTORY_MAX_ENTRIES = 50
+# Compact the history file back to HISTORY_MAX_ENTRIES once it is past this size
+# and twice its size after the previous compaction, so rewrites stay amortized
+HISTORY_TRIM_BYTES = 256 * 1024
 DEFAULT_ENV_SCRIPT = None  # Will be set from config
 # Default to a 'logs' folder relative to the data directory (self-contained)
 DEFAULT_LOG_DIR = os.path.join(DATA_DIR, 'logs')
@@ -56,8 +148,8 @@ def load_config():
 
     if os.path.exists(CONFIG_FILE) and os.path.getsize(CONFIG_FILE) > 0:
         try:
-            with open(CONFIG_FILE, 'r') as f:
-                config = json.load(f)
+            with open(CONFIG_FILE, 'rb') as f:
+                config = json_loads(f.read())
                 # Merge with defaults to ensure all keys exist
                 for key, value in default_config.items():
                     if key not in config:
@@ -73,7 +165,7 @@ def load_config():
                     LOG_DIR = None
                     LOG_FILE = None
                 return config
-        except (json.JSONDecodeError, ValueError):
+        except ValueError:
             # If config file is corrupted, return defaults
             print(f"Warning: Config file {CONFIG_FILE} is corrupted. Using defaults.")
 
@@ -81,13 +173,68 @@ def load_config():
 
 def save_config(config):
     """Save configuration to JSON file."""
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    write_json_file(CONFIG_FILE, config)
+
+# Command log records are queued by the request thread and appended to disk by
+# a background writer, so disk latency never delays /api/run-command
+LOG_QUEUE_SIZE = 1024
+_LOG_QUEUE = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+
+def _log_worker():
+    """Append queued (log_file_path, text) records, one write per file per burst."""
+    running = True
+    while running:
+        batch = [_LOG_QUEUE.get()]
+        # Drain everything already queued so a burst is written in one go
+        while True:
+            try:
+                batch.append(_LOG_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        
+        records = {}
+        for item in batch:
+            if item is None:  # Shutdown sentinel
+                running = False
+                continue
+            log_file_path, text = item
+            records.setdefault(log_file_path, []).append(text)
+        
+        for log_file_path, texts in records.items():
+            try:
+                # Ensure log directory exists
+                os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
+                data = memoryview(''.join(texts).encode('utf-8'))
+                fd = os.open(log_file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    # The whole burst goes out in a single append; loop only on a short write
+                    while data:
+                        data = data[os.write(fd, data):]
+                finally:
+                    os.close(fd)
+            except Exception as e:
+                print(f"Warning: Failed to log command: {e}", file=sys.stderr)
+        
+        for _ in batch:
+            _LOG_QUEUE.task_done()
+
+_LOG_THREAD = threading.Thread(target=_log_worker, name='command-log', daemon=True)
+_LOG_THREAD.start()
+
+@atexit.register
+def _stop_log_worker():
+    """Flush pending log records before the interpreter exits."""
+    try:
+        _LOG_QUEUE.put(None, timeout=1)
+    except queue.Full:
+        return
+    _LOG_THREAD.join(timeout=5)
 
 def log_command(script_path, args_dict, pre_command, comment, session_name, command, log_dir=None):
     """
     Log the executed command to a file with timestamp and metadata.
     If log_dir is None, logging is disabled.
+    The record is written asynchronously by the background log writer.
     """
     if log_dir is None:
         return  # Logging disabled
@@ -97,160 +244,465 @@ def log_command(script_path, args_dict, pre_command, comment, session_name, comm
         log_directory = log_dir if log_dir else LOG_DIR
         log_file_path = os.path.join(log_directory, 'command_log.txt')
         
-        # Ensure log directory exists
-        os.makedirs(log_directory, exist_ok=True)
-        
         # Get current timestamp
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         # Build log entry
-        log_entry = []
-        log_entry.append("=" * 80)
-        log_entry.append(f"Timestamp: {timestamp}")
-        log_entry.append(f"Script: {script_path}")
-        if comment:
-            log_entry.append(f"Comment: {comment}")
-        if pre_command:
-            log_entry.append(f"Pre-command: {pre_command}")
-        log_entry.append(f"Byobu Session: {session_name}")
-        log_entry.append("-" * 80)
-        log_entry.append("Arguments:")
-        for key, value in sorted(args_dict.items()):
-            log_entry.append(f"  --{key}: {value}")
-        log_entry.append("-" * 80)
-        log_entry.append("Full Command:")
-        log_entry.append(command)
-        log_entry.append("=" * 80)
-        log_entry.append("")  # Empty line for readability
-        
-        # Append to log file
-        with open(log_file_path, 'a', encoding='utf-8') as f:
-            f.write('\n'.join(log_entry))
-            f.write('\n')
+        arguments = ''.join(f"  --{key}: {value}\n" for key, value in sorted(args_dict.items()))
+        log_entry = (
+            f"{'=' * 80}\n"
+            f"Timestamp: {timestamp}\n"
+            f"Script: {script_path}\n"
+            + (f"Comment: {comment}\n" if comment else "")
+            + (f"Pre-command: {pre_command}\n" if pre_command else "")
+            + f"Byobu Session: {session_name}\n"
+            f"{'-' * 80}\n"
+            "Arguments:\n"
+            f"{arguments}"
+            f"{'-' * 80}\n"
+            "Full Command:\n"
+            f"{command}\n"
+            f"{'=' * 80}\n"
+            "\n"  # Empty line for readability
+        )
+        
+        # Hand off to the background writer; drop the record if it is backed up
+        _LOG_QUEUE.put_nowait((log_file_path, log_entry))
+    except queue.Full:
+        print("Warning: Command log queue is full, dropping log entry", file=sys.stderr)
     except Exception as e:
         # Don't fail the command execution if logging fails
         print(f"Warning: Failed to log command: {e}", file=sys.stderr)
 
+# Command history storage: append-only MessagePack records, each prefixed
+# with its 4-byte big-endian length, so older entries are never re-encoded.
+_HISTORY_LOCK = threading.Lock()
+_HISTORY_MIGRATED = False  # Set once migrate_legacy_history() has run
+# end: offset just past the last intact frame, found by one scan per process (None = unknown)
+_HISTORY_STATE = {'end': None, 'trimmed': 0}  # trimmed: file size after the last trim
+
+def _history_frames(buf):
+    """Yield (start, end) payload offsets of every complete frame in buf."""
+    offset, size = 0, len(buf)
+    while offset + 4 <= size:
+        start = offset + 4
+        end = start + int.from_bytes(buf[offset:start], 'big')
+        if end > size:
+            break  # Truncated trailing frame from an interrupted write
+        yield start, end
+        offset = end
+
+def load_history(limit=HISTORY_MAX_ENTRIES):
+    """
+    Load the most recent history entries, newest first.
+    Only the frame headers are walked; just the last `limit` payloads are decoded.
+    """
+    migrate_legacy_history()
+    try:
+        with open(HISTORY_FILE, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                frames = list(_history_frames(buf))[-limit:]
+                history = []
+                for start, end in reversed(frames):
+                    try:
+                        history.append(msgspec.msgpack.decode(buf[start:end]))
+                    except msgspec.DecodeError:
+                        continue
+                return history
+    except FileNotFoundError:
+        return []
+
+def _scan_history():
+    """
+    Return the offset just past the last intact frame of the history file.
+    Frames are decoded in order, so a torn frame left by an interrupted append
+    ends the scan even when later appends landed after it.
+    """
+    try:
+        with open(HISTORY_FILE, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                valid_end = 0
+                for start, end in _history_frames(buf):
+                    try:
+                        msgspec.msgpack.decode(buf[start:end])
+                    except msgspec.DecodeError:
+                        break
+                    valid_end = end
+                return valid_end
+    except FileNotFoundError:
+        return 0
+
+def trim_history(keep=HISTORY_MAX_ENTRIES):
+    """Rewrite the history file with only its last `keep` frames (copied verbatim)."""
+    with open(HISTORY_FILE, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            frames = list(_history_frames(buf))[-keep:]
+            if not frames:
+                return
+            tail = buf[frames[0][0] - 4:frames[-1][1]]
+    tmp_path = HISTORY_FILE + '.tmp'
+    with open(tmp_path, 'wb', buffering=65536) as f:
+        f.write(tail)
+    os.replace(tmp_path, HISTORY_FILE)
+    _HISTORY_STATE['end'] = _HISTORY_STATE['trimmed'] = len(tail)
+
+def append_history(entry):
+    """Append a single entry to the history file, trimming it when it grows too large."""
+    migrate_legacy_history()
+    data = msgspec.msgpack.encode(entry)
+    frame = len(data).to_bytes(4, 'big') + data
+    with _HISTORY_LOCK:
+        if _HISTORY_STATE['end'] is None:
+            _HISTORY_STATE['end'] = _scan_history()
+        end = _HISTORY_STATE['end']
+        try:
+            with open(HISTORY_FILE, 'ab') as f:
+                if f.seek(0, os.SEEK_END) != end:
+                    # Cut off a torn frame so this one starts on a frame boundary
+                    f.truncate(end)
+                f.write(frame)
+        except BaseException:
+            _HISTORY_STATE['end'] = None  # This write may be torn too; rescan next time
+            raise
+        _HISTORY_STATE['end'] = end + len(frame)
+        if _HISTORY_STATE['end'] > max(HISTORY_TRIM_BYTES, 2 * _HISTORY_STATE['trimmed']):
+            trim_history()
+
+def migrate_legacy_history():
+    """
+    Import a legacy command_history.json into the framed history file, ahead of
+    any entries already recorded there. The legacy file is kept as
+    command_history.json.bak. Called before the history is first read or written,
+    so it only touches the filesystem once per process.
+    """
+    global _HISTORY_MIGRATED
+    if _HISTORY_MIGRATED:
+        return
+    with _HISTORY_LOCK:
+        if _HISTORY_MIGRATED:
+            return
+        _HISTORY_MIGRATED = True
+        try:
+            with open(LEGACY_HISTORY_FILE, 'rb') as f:
+                legacy = json_loads(f.read())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Warning: Failed to migrate legacy history: {e}", file=sys.stderr)
+            return
+        try:
+            frames = []
+            for entry in reversed(legacy[:HISTORY_MAX_ENTRIES]):  # Oldest first, like appends
+                data = msgspec.msgpack.encode(entry)
+                frames.append(len(data).to_bytes(4, 'big') + data)
+            # Legacy entries predate anything appended since the format change
+            try:
+                with open(HISTORY_FILE, 'rb') as f:
+                    frames.append(f.read())
+            except FileNotFoundError:
+                pass
+            tmp_path = HISTORY_FILE + '.tmp'
+            with open(tmp_path, 'wb', buffering=65536) as f:
+                f.write(b''.join(frames))
+            os.replace(tmp_path, HISTORY_FILE)
+            _HISTORY_STATE['end'] = None
+            os.replace(LEGACY_HISTORY_FILE, LEGACY_HISTORY_FILE + '.bak')
+        except Exception as e:
+            print(f"Warning: Failed to migrate legacy history: {e}", file=sys.stderr)
+
+def _is_json_native(value):
+    """True if a literal_eval() result serializes to JSON as-is (no sets, bytes, complex, ...)."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(map(_is_json_native, value))
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_json_native(v) for k, v in value.items())
+    return False
+
+def _parse_add_argument_call(node, content):
+    """
+    Build an argument definition from an add_argument(...) ast.Call node.
+    Returns None for positional arguments, which the form cannot pass as --flags.
+    """
+    options = [a.value for a in node.args
+               if isinstance(a, ast.Constant) and isinstance(a.value, str) and a.value.startswith('-')]
+    if not options:
+        return None
+
+    # Prefer the long form as the name (e.g. '-l', '--learning-rate' -> '--learning-rate')
+    long_options = [opt for opt in options if opt.startswith('--')]
+    arg_dict = {'name': long_options[0] if long_options else options[0]}
+    short_options = [opt for opt in options if not opt.startswith('--') and opt != arg_dict['name']]
+    if short_options:
+        arg_dict['short'] = short_options[0]
+
+    kwargs = {kw.arg: kw.value for kw in node.keywords if kw.arg}
+
+    def literal(key):
+        """Return (True, value) if the keyword is a Python literal, else (False, None)."""
+        try:
+            return True, ast.literal_eval(kwargs[key])
+        except (KeyError, ValueError, TypeError, SyntaxError):
+            return False, None
+
+    # Check for action='store_true' or 'store_false' first (these are boolean flags)
+    _, action = literal('action')
+    if action in ('store_true', 'store_false'):
+        arg_dict['type'] = 'bool'
+        arg_dict['action'] = action[len('store_'):]  # 'true' or 'false'
+        # store_true defaults to False, store_false defaults to True
+        arg_dict['default'] = action == 'store_false'
+    else:
+        # type=int, type=float, type=pathlib.Path, ... (bool stays 'bool' for a checkbox)
+        type_node = kwargs.get('type')
+        if isinstance(type_node, ast.Name):
+            arg_dict['type'] = type_node.id
+        elif isinstance(type_node, ast.Attribute):
+            arg_dict['type'] = type_node.attr
+        else:
+            arg_dict['type'] = 'str'  # default
+
+    found, help_text = literal('help')
+    if found and isinstance(help_text, str):
+        arg_dict['help'] = help_text
+
+    if 'default' in kwargs:
+        found, default_val = literal('default')
+        if not found or not _is_json_native(default_val):
+            # Non-literal default (e.g. os.getcwd()) or one JSON cannot carry
+            # (e.g. a set or bytes): show the source expression
+            default_val = ast.get_source_segment(content, kwargs['default'])
+        if default_val is not None:
+            arg_dict['default'] = default_val
+
+    _, required = literal('required')
+    arg_dict['required'] = required is True
+
+    found, choices = literal('choices')
+    if found and isinstance(choices, (list, tuple, set)) and all(map(_is_json_native, choices)):
+        arg_dict['choices'] = list(choices)
+
+    found, nargs = literal('nargs')
+    if found and nargs is not None:
+        arg_dict['nargs'] = str(nargs)
+        # For nargs='+' or '*', we might want to handle it as a list
+        if nargs in ('+', '*'):
+            arg_dict['multiple'] = True
+
+    return arg_dict
+
+# Precompiled patterns for the regex fallback parser
+_PARSER_RE = re.compile(r'(\w+)\s*=\s*argparse\.ArgumentParser')
+_ADDARG_RE_TMPL = r'{parser_var}\.add_argument\s*\((.*?)\)'
+_NAME_RE = re.compile(r"['\"](--?[\w-]+)[\"']")
+_SHORT_RE = re.compile(r"['\"](-[a-zA-Z]+)[\"']")
+_ACTION_RE = re.compile(r"action\s*=\s*['\"]store_(true|false)['\"]")
+_TYPE_RE = re.compile(r'type\s*=\s*(\w+)')
+_HELP_RE = re.compile(r"help\s*=\s*['\"]([^'\"]+)['\"]")
+_DEFAULT_RE = re.compile(r'default\s*=\s*([^,)]+)')
+_REQUIRED_RE = re.compile(r'required\s*=\s*(True|False)')
+_CHOICES_RE = re.compile(r'choices\s*=\s*\[(.*?)\]')
+_NARGS_RE = re.compile(r"nargs\s*=\s*['\"]?([+*?]|\d+)['\"]?")
+
+def _parse_argparse_regex(content):
+    """
+    Regex-based fallback for scripts that the running Python cannot parse
+    (e.g. syntax from a newer interpreter version).
+    """
+    # Extract all add_argument calls
+    args = []
+    # Pattern to match add_argument calls (handles multi-line and different variable names)
+    # First, try to find the parser variable name
+    parser_var_match = _PARSER_RE.search(content)
+    parser_var = parser_var_match.group(1) if parser_var_match else 'parser'
+
+    # Pattern to match add_argument calls with the found variable name
+    pattern = re.compile(_ADDARG_RE_TMPL.format(parser_var=re.escape(parser_var)), re.DOTALL)
+
+    for match in pattern.finditer(content):
+        arg_str = match.group(1)
+        arg_dict = {}
+
+        # Parse the argument string
+        # Handle both '--arg' and '-short' formats
+        # Allow hyphens in argument names (e.g., --log-level, --learning-rate)
+        name_match = _NAME_RE.search(arg_str)
+        if name_match:
+            arg_dict['name'] = name_match.group(1)
+
+        # Check for short form
+        short_match = _SHORT_RE.search(arg_str)
+        if short_match and short_match.group(1) != arg_dict.get('name', ''):
+            arg_dict['short'] = short_match.group(1)
+
+        # Check for action='store_true' or 'store_false' first (these are boolean flags)
+        action_match = _ACTION_RE.search(arg_str)
+        if action_match:
+            arg_dict['type'] = 'bool'
+            arg_dict['action'] = action_match.group(1)  # 'true' or 'false'
+            # Set default based on action: store_true defaults to False, store_false defaults to True
+            if action_match.group(1) == 'true':
+                arg_dict['default'] = False
+            else:  # store_false
+                arg_dict['default'] = True
+        else:
+            # Extract type
+            type_match = _TYPE_RE.search(arg_str)
+            if type_match:
+                arg_type = type_match.group(1)
+                # Handle bool type (argparse treats type=bool as string conversion, but we want checkbox)
+                if arg_type == 'bool':
+                    arg_dict['type'] = 'bool'
+                else:
+                    arg_dict['type'] = arg_type
+            else:
+                arg_dict['type'] = 'str'  # default
+
+        # Extract help
+        help_match = _HELP_RE.search(arg_str)
+        if help_match:
+            arg_dict['help'] = help_match.group(1)
+
+        # Extract default
+        default_match = _DEFAULT_RE.search(arg_str)
+        if default_match:
+            default_val = default_match.group(1).strip()
+            # Try to evaluate the default value
+            try:
+                if default_val.startswith("'") or default_val.startswith('"'):
+                    arg_dict['default'] = default_val.strip("'\"")
+                elif default_val.lower() in ['true', 'false']:
+                    arg_dict['default'] = default_val.lower() == 'true'
+                elif default_val.replace('.', '').replace('-', '').isdigit():
+                    if '.' in default_val:
+                        arg_dict['default'] = float(default_val)
+                    else:
+                        arg_dict['default'] = int(default_val)
+                else:
+                    arg_dict['default'] = default_val
+            except:
+                arg_dict['default'] = default_val
+
+        # Check if required
+        required_match = _REQUIRED_RE.search(arg_str)
+        if required_match:
+            arg_dict['required'] = required_match.group(1) == 'True'
+        else:
+            arg_dict['required'] = False
+
+        # Extract choices
+        choices_match = _CHOICES_RE.search(arg_str)
+        if choices_match:
+            choices_str = choices_match.group(1)
+            # Parse choices (simple string list)
+            choices = [c.strip().strip("'\"") for c in choices_str.split(',')]
+            arg_dict['choices'] = choices
+
+        # Extract nargs (for handling multiple values)
+        nargs_match = _NARGS_RE.search(arg_str)
+        if nargs_match:
+            nargs_val = nargs_match.group(1)
+            arg_dict['nargs'] = nargs_val
+            # For nargs='+' or '*', we might want to handle it as a list
+            if nargs_val in ['+', '*']:
+                arg_dict['multiple'] = True
+
+        args.append(arg_dict)
+
+    return args
+
+_GROUP_METHODS = ('add_argument_group', 'add_mutually_exclusive_group')
+
+def _dotted_name(node):
+    """Return 'a.b.c' for a Name/Attribute chain (e.g. self.parser), else None."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+def _is_receiver(node, receivers):
+    """True if node is a top-level parser, one of its groups, or an inline group call on them."""
+    if isinstance(node, ast.Call):
+        return (isinstance(node.func, ast.Attribute) and node.func.attr in _GROUP_METHODS
+                and _is_receiver(node.func.value, receivers))
+    return _dotted_name(node) in receivers
+
+def _argparse_receivers(tree):
+    """
+    Names that hold the script's ArgumentParser or a group created from it.
+    Parsers returned by add_parser() (subcommands) are deliberately not included.
+    """
+    assignments = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and isinstance(node.value, ast.Call):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = [name for name in map(_dotted_name, targets) if name]
+            if names:
+                assignments.append((names, node.value))
+
+    receivers = set()
+    for names, call in assignments:
+        func = call.func
+        if (isinstance(func, ast.Name) and func.id == 'ArgumentParser') or \
+           (isinstance(func, ast.Attribute) and func.attr == 'ArgumentParser'):
+            receivers.update(names)
+    if not receivers:
+        receivers.add('parser')  # Same guess as the regex fallback
+
+    # Groups can be nested, so repeat until no new names turn up
+    changed = True
+    while changed:
+        changed = False
+        for names, call in assignments:
+            if not set(names) <= receivers and _is_receiver(call, receivers):
+                receivers.update(names)
+                changed = True
+    return receivers
+
 def parse_argparse_from_file(script_path):
     """
     Parse argparse arguments from a Python script by analyzing the source code.
     Returns a list of argument definitions.
     """
     try:
-        if not os.path.exists(script_path):
+        try:
+            with open(script_path, 'r') as f:
+                content = f.read()
+        except FileNotFoundError:
             raise FileNotFoundError(f"Script not found: {script_path}")
         
-        with open(script_path, 'r') as f:
-            content = f.read()
-        
-        # Find the ArgumentParser instantiation (more flexible pattern)
-        # This handles: parser = argparse.ArgumentParser(...) or any_var = argparse.ArgumentParser(...)
-        parser_pattern = r'\w+\s*=\s*argparse\.ArgumentParser\([^)]*\)'
-        if not re.search(parser_pattern, content):
-            # Try alternative patterns
-            if 'ArgumentParser' not in content:
-                raise ValueError("No ArgumentParser found in script. Make sure your script uses argparse.")
-            # Maybe parser is created differently, try to find add_argument calls anyway
+        if 'ArgumentParser' not in content:
+            raise ValueError("No ArgumentParser found in script. Make sure your script uses argparse.")
         
-        # Extract all add_argument calls
-        args = []
-        # Pattern to match add_argument calls (handles multi-line and different variable names)
-        # First, try to find the parser variable name
-        parser_var_match = re.search(r'(\w+)\s*=\s*argparse\.ArgumentParser', content)
-        parser_var = parser_var_match.group(1) if parser_var_match else 'parser'
+        try:
+            tree = ast.parse(content, filename=script_path)
+        except SyntaxError:
+            return _parse_argparse_regex(content)
         
-        # Pattern to match add_argument calls with the found variable name
-        pattern = rf'{re.escape(parser_var)}\.add_argument\s*\((.*?)\)'
+        # Collect the <parser or group>.add_argument(...) calls in source order;
+        # arguments added to subparsers are not accepted by the top-level command
+        receivers = _argparse_receivers(tree)
+        calls = [node for node in ast.walk(tree)
+                 if isinstance(node, ast.Call)
+                 and isinstance(node.func, ast.Attribute)
+                 and node.func.attr == 'add_argument'
+                 and _is_receiver(node.func.value, receivers)]
+        calls.sort(key=lambda node: (node.lineno, node.col_offset))
         
-        for match in re.finditer(pattern, content, re.DOTALL):
-            arg_str = match.group(1)
-            arg_dict = {}
-            
-            # Parse the argument string
-            # Handle both '--arg' and '-short' formats
-            # Allow hyphens in argument names (e.g., --log-level, --learning-rate)
-            name_match = re.search(r"['\"](--?[\w-]+)[\"']", arg_str)
-            if name_match:
-                arg_dict['name'] = name_match.group(1)
-            
-            # Check for short form
-            short_match = re.search(r"['\"](-[a-zA-Z]+)[\"']", arg_str)
-            if short_match and short_match.group(1) != arg_dict.get('name', ''):
-                arg_dict['short'] = short_match.group(1)
-            
-            # Check for action='store_true' or 'store_false' first (these are boolean flags)
-            action_match = re.search(r"action\s*=\s*['\"]store_(true|false)['\"]", arg_str)
-            if action_match:
-                arg_dict['type'] = 'bool'
-                arg_dict['action'] = action_match.group(1)  # 'true' or 'false'
-                # Set default based on action: store_true defaults to False, store_false defaults to True
-                if action_match.group(1) == 'true':
-                    arg_dict['default'] = False
-                else:  # store_false
-                    arg_dict['default'] = True
-            else:
-                # Extract type
-                type_match = re.search(r'type\s*=\s*(\w+)', arg_str)
-                if type_match:
-                    arg_type = type_match.group(1)
-                    # Handle bool type (argparse treats type=bool as string conversion, but we want checkbox)
-                    if arg_type == 'bool':
-                        arg_dict['type'] = 'bool'
-                    else:
-                        arg_dict['type'] = arg_type
-                else:
-                    arg_dict['type'] = 'str'  # default
-            
-            # Extract help
-            help_match = re.search(r"help\s*=\s*['\"]([^'\"]+)['\"]", arg_str)
-            if help_match:
-                arg_dict['help'] = help_match.group(1)
-            
-            # Extract default
-            default_match = re.search(r'default\s*=\s*([^,)]+)', arg_str)
-            if default_match:
-                default_val = default_match.group(1).strip()
-                # Try to evaluate the default value
-                try:
-                    if default_val.startswith("'") or default_val.startswith('"'):
-                        arg_dict['default'] = default_val.strip("'\"")
-                    elif default_val.lower() in ['true', 'false']:
-                        arg_dict['default'] = default_val.lower() == 'true'
-                    elif default_val.replace('.', '').replace('-', '').isdigit():
-                        if '.' in default_val:
-                            arg_dict['default'] = float(default_val)
-                        else:
-                            arg_dict['default'] = int(default_val)
-                    else:
-                        arg_dict['default'] = default_val
-                except:
-                    arg_dict['default'] = default_val
-            
-            # Check if required
-            required_match = re.search(r'required\s*=\s*(True|False)', arg_str)
-            if required_match:
-                arg_dict['required'] = required_match.group(1) == 'True'
-            else:
-                arg_dict['required'] = False
-            
-            # Extract choices
-            choices_match = re.search(r'choices\s*=\s*\[(.*?)\]', arg_str)
-            if choices_match:
-                choices_str = choices_match.group(1)
-                # Parse choices (simple string list)
-                choices = [c.strip().strip("'\"") for c in choices_str.split(',')]
-                arg_dict['choices'] = choices
-            
-            # Extract nargs (for handling multiple values)
-            nargs_match = re.search(r"nargs\s*=\s*['\"]?([+*?]|\d+)['\"]?", arg_str)
-            if nargs_match:
-                nargs_val = nargs_match.group(1)
-                arg_dict['nargs'] = nargs_val
-                # For nargs='+' or '*', we might want to handle it as a list
-                if nargs_val in ['+', '*']:
-                    arg_dict['multiple'] = True
-            
-            args.append(arg_dict)
+        args = []
+        for node in calls:
+            arg_dict = _parse_add_argument_call(node, content)
+            if arg_dict:
+                args.append(arg_dict)
         
         return args
     except FileNotFoundError as e:
@@ -258,6 +710,19 @@ def parse_argparse_from_file(script_path):
     except Exception as e:
         raise ValueError(f"Error parsing argparse from script: {str(e)}")
 
+@functools.lru_cache(maxsize=128)
+def _cached_parse(script_path, mtime_ns, size):
+    """
+    Memoized parse_argparse_from_file(), keyed by the script's stat signature so
+    any edit to the file produces a new cache entry. Returns (args, required),
+    where required holds (args_dict key, argument name) pairs for the required
+    arguments in declaration order. Both are shared between callers and must
+    not be mutated.
+    """
+    args = parse_argparse_from_file(script_path)
+    required = tuple((arg['name'].replace('--', ''), arg['name']) for arg in args if arg.get('required'))
+    return args, required
+
 def build_command(script_path, args_dict, pre_command=None, comment=""):
     """
     Build the command to execute in byobu.
@@ -277,8 +742,8 @@ def build_command(script_path, args_dict, pre_command=None, comment=""):
                 cmd_parts.append(pre_cmd_combined)
                 cmd_parts.append("&&")
     
-    # Build Python command with arguments
-    python_cmd = f"python {script_path}"
+    # Build Python command with arguments as an argv list, quoted for the shell at the end
+    argv = ['python', script_path]
     
     for key, value in args_dict.items():
         if value is not None and value != "":
@@ -288,12 +753,11 @@ def build_command(script_path, args_dict, pre_command=None, comment=""):
             # For store_false: include --flag if value is True (to disable, making it False)
             # For regular bool: include --flag True/False
             if isinstance(value, bool):
-                python_cmd += f" --{key}"
-            # Handle string values with spaces (quote them)
-            elif isinstance(value, str) and ' ' in value:
-                python_cmd += f" --{key} '{value}'"
+                argv.append(f"--{key}")
             else:
-                python_cmd += f" --{key} {value}"
+                argv.extend((f"--{key}", str(value)))
+    
+    python_cmd = shlex.join(argv)
     
     cmd_parts.append(python_cmd)
     
@@ -304,46 +768,71 @@ def build_command(script_path, args_dict, pre_command=None, comment=""):
     
     return " ".join(cmd_parts)
 
+# `byobu list-sessions` output is reused for this long to skip a fork+exec per run
+SESSIONS_CACHE_TTL = 0.5  # seconds
+_SESSIONS_CACHE = {'at': 0.0, 'result': None}
+
+def list_byobu_sessions():
+    """Return (returncode, stdout) of `byobu list-sessions`, cached for SESSIONS_CACHE_TTL."""
+    now = time.monotonic()
+    if _SESSIONS_CACHE['result'] is None or now - _SESSIONS_CACHE['at'] > SESSIONS_CACHE_TTL:
+        check_session = subprocess.run(
+            ['byobu', 'list-sessions'],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        _SESSIONS_CACHE['result'] = (check_session.returncode, check_session.stdout)
+        _SESSIONS_CACHE['at'] = now
+    return _SESSIONS_CACHE['result']
+
+def invalidate_byobu_sessions():
+    """Force the next list_byobu_sessions() call to query byobu again."""
+    _SESSIONS_CACHE['result'] = None
+
+# Per-run helper scripts live on RAM-backed tmpfs when available
+BYOBU_SCRIPT_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None  # None: system temp dir
+
 def execute_in_byobu(command, session_name="training"):
     """
     Execute a command in a byobu terminal session.
     Always opens a new window in the current/existing session.
     """
+    script_file = None
+    launched = False
     try:
-        # Create a script file that will be executed in byobu
-        script_file = os.path.join(os.path.dirname(__file__), 'temp_byobu_script.sh')
-        with open(script_file, 'w') as f:
+        # Create a unique script file per run that will be executed in byobu
+        # mkstemp's 0600 is kept: the script holds the pre-command and is run
+        # as `bash <path>`, so it needs neither the exec bit nor other readers
+        fd, script_file = tempfile.mkstemp(dir=BYOBU_SCRIPT_DIR, prefix='byobu_', suffix='.sh')
+        
+        # Quote the script file path to handle spaces/special characters
+        script_file_quoted = shlex.quote(script_file)
+        
+        with os.fdopen(fd, 'w') as f:
             f.write("#!/bin/bash\n")
+            # bash keeps the open script readable, so it can remove itself right away
+            f.write(f"rm -f -- {script_file_quoted}\n")
             f.write("set -e\n")  # Exit on error
             f.write("clear\n")  # Clear the terminal screen for a fresh start
             f.write(command)
             f.write("\n")
         
-        os.chmod(script_file, 0o755)
-        
         # Check if byobu session exists
-        check_session = subprocess.run(
-            ['byobu', 'list-sessions'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        
-        # Quote the script file path to handle spaces/special characters
-        script_file_quoted = f"'{script_file}'"
+        returncode, sessions_output = list_byobu_sessions()
         
         # Try to find an existing session (prefer the specified one, or any existing)
         session_exists = False
         target_session = session_name
         
-        if check_session.returncode == 0 and check_session.stdout.strip():
+        if returncode == 0 and sessions_output.strip():
             # Check if specified session exists
-            if session_name in check_session.stdout:
+            if session_name in sessions_output:
                 session_exists = True
                 target_session = session_name
             else:
                 # Try to find any existing session (use the first one)
-                lines = [line.strip() for line in check_session.stdout.strip().split('\n') if line.strip()]
+                lines = [line.strip() for line in sessions_output.strip().split('\n') if line.strip()]
                 if lines:
                     # Parse session name from byobu list-sessions output (format: "session_name: 1 windows")
                     for line in lines:
@@ -356,11 +845,11 @@ def execute_in_byobu(command, session_name="training"):
         
         if session_exists:
             # Use a unique window name based on timestamp to avoid conflicts
-            window_name = f"run_{int(time.time() * 1000)}"  # Use milliseconds for better uniqueness
+            window_name = f"run_{time.time_ns()}"  # Nanoseconds make collisions very unlikely
             
             # Create a new window in the existing session
             # Retry logic in case of index conflicts
-            max_retries = 5
+            max_retries = 3
             message = None
             for attempt in range(max_retries):
                 # Use -a flag to append window at the end and -k to kill if name exists
@@ -387,18 +876,16 @@ def execute_in_byobu(command, session_name="training"):
                     # Check if error is about index in use
                     error_msg = result.stderr.lower() if result.stderr else ""
                     if "index" in error_msg and "in use" in error_msg:
-                        # Wait longer between retries to let byobu process
+                        # A name/index clash, not contention: retry right away under a new name
                         if attempt < max_retries - 1:
-                            # Exponential backoff: 0.5s, 1.0s, 1.5s, 2.0s
-                            time.sleep(0.5 * (attempt + 1))
-                            # Generate new unique name for next attempt
-                            window_name = f"run_{int(time.time() * 1000)}_{attempt + 1}"
+                            window_name = f"run_{time.time_ns()}_{attempt + 1}"
                             continue
                         else:
                             # Last attempt failed, return error
                             return {'success': False, 'message': f'Failed to create window after {max_retries} attempts: {result.stderr}'}
                     else:
-                        # Different error, return immediately
+                        # Different error (e.g. the session went away), return immediately
+                        invalidate_byobu_sessions()
                         return {'success': False, 'message': f'Error creating window: {result.stderr}'}
             
             # If we get here and message is None, all retries failed
@@ -410,8 +897,10 @@ def execute_in_byobu(command, session_name="training"):
                 ['byobu', 'new-session', '-d', '-s', target_session, 'bash', '-c', f'bash {script_file_quoted}; exec bash'],
                 cwd=os.path.expanduser('~')
             )
+            invalidate_byobu_sessions()
             message = f'Created new byobu session "{target_session}" and started command'
         
+        launched = True
         return {'success': True, 'message': message}
     except subprocess.TimeoutExpired:
         return {'success': False, 'message': 'Timeout while executing byobu command'}
@@ -419,6 +908,13 @@ def execute_in_byobu(command, session_name="training"):
         return {'success': False, 'message': 'byobu not found. Please install byobu: sudo apt-get install byobu'}
     except Exception as e:
         return {'success': False, 'message': f'Error executing in byobu: {str(e)}'}
+    finally:
+        # The script deletes itself once it runs; clean up if it never will
+        if script_file and not launched:
+            try:
+                os.remove(script_file)
+            except OSError:
+                pass
 
 @app.route('/')
 def index():
@@ -430,18 +926,16 @@ FAVORITES_FILE = os.path.join(HISTORY_DIR, 'favorites.json')
 
 def load_favorites():
     """Load favorites from JSON file."""
-    if os.path.exists(FAVORITES_FILE):
-        try:
-            with open(FAVORITES_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            pass
+    try:
+        with open(FAVORITES_FILE, 'rb') as f:
+            return json_loads(f.read())
+    except:
+        pass
     return {'paths': [], 'recent': []}
 
 def save_favorites(favorites):
     """Save favorites to JSON file."""
-    with open(FAVORITES_FILE, 'w') as f:
-        json.dump(favorites, f, indent=2)
+    write_json_file(FAVORITES_FILE, favorites)
 
 def add_to_recent(path, max_recent=10):
     """Add a path to recent history."""
@@ -461,6 +955,8 @@ def browse_directory():
     """Browse filesystem directories and list Python files."""
     path = request.args.get('path', '')
     file_filter = request.args.get('filter', '.py')
+    # Comma-separated suffixes (e.g. '.py,.ipynb'), parsed once for str.endswith()
+    file_suffixes = tuple(s.strip() for s in file_filter.split(',') if s.strip())
     show_hidden = request.args.get('show_hidden', 'false').lower() == 'true'
     
     # Default to home directory if no path specified
@@ -471,55 +967,48 @@ def browse_directory():
         path = os.path.abspath(path)
     
     # Validate path exists
-    if not os.path.exists(path):
-        return jsonify({'error': f'Path does not exist: {path}'}), 400
+    try:
+        st = os.stat(path)
+    except OSError:
+        return json_response({'error': f'Path does not exist: {path}'}, 400)
     
     # If path is a file, use its parent directory
-    if os.path.isfile(path):
+    if stat.S_ISREG(st.st_mode):
         path = os.path.dirname(path)
     
-    try:
-        entries = os.listdir(path)
-    except PermissionError:
-        return jsonify({'error': f'Permission denied: {path}'}), 403
-    except Exception as e:
-        return jsonify({'error': str(e)}), 400
-    
+    # Entries are collected as (lowercased name, name, path[, size]) tuples so
+    # a plain sort orders them case-insensitively without a key function
     directories = []
     files = []
     
-    for entry in entries:
-        # Skip hidden files unless requested
-        if not show_hidden and entry.startswith('.'):
-            continue
-        
-        full_path = os.path.join(path, entry)
-        
-        try:
-            if os.path.isdir(full_path):
-                directories.append({
-                    'name': entry,
-                    'path': full_path,
-                    'type': 'directory'
-                })
-            elif os.path.isfile(full_path):
-                # Apply file filter
-                if file_filter:
-                    if not entry.endswith(file_filter):
-                        continue
-                files.append({
-                    'name': entry,
-                    'path': full_path,
-                    'type': 'file',
-                    'size': os.path.getsize(full_path)
-                })
-        except (PermissionError, OSError):
-            # Skip files we can't access
-            continue
+    try:
+        # scandir yields the entry type from the directory read itself, so only
+        # matching files need a stat() call (for their size)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # Skip hidden files unless requested
+                if not show_hidden and entry.name.startswith('.'):
+                    continue
+                
+                try:
+                    if entry.is_dir():
+                        directories.append((entry.name.lower(), entry.name, entry.path))
+                    elif entry.is_file():
+                        # Apply file filter
+                        if file_suffixes and not entry.name.endswith(file_suffixes):
+                            continue
+                        files.append((entry.name.lower(), entry.name, entry.path, entry.stat().st_size))
+                except (PermissionError, OSError):
+                    # Skip files we can't access
+                    continue
+    except PermissionError:
+        return json_response({'error': f'Permission denied: {path}'}, 403)
+    except Exception as e:
+        return json_response({'error': str(e)}, 400)
     
     # Sort alphabetically (case-insensitive)
-    directories.sort(key=lambda x: x['name'].lower())
-    files.sort(key=lambda x: x['name'].lower())
+    directories.sort()
+    files.sort()
     
     # Build breadcrumb path segments
     path_parts = path.split(os.sep)
@@ -527,12 +1016,11 @@ def browse_directory():
     current_path = ''
     for i, part in enumerate(path_parts):
         if part:
-            current_path = os.sep.join(path_parts[:i+1])
-            if not current_path:
-                current_path = os.sep
+            # Extend the previous crumb instead of re-joining every prefix
+            current_path = f'{current_path}{os.sep}{part}' if i else part
             breadcrumbs.append({
-                'name': part if part else os.sep,
-                'path': current_path if current_path else os.sep
+                'name': part,
+                'path': current_path
             })
     
     # Add root if path starts with /
@@ -542,12 +1030,20 @@ def browse_directory():
     # Track this as a recent path
     add_to_recent(path)
     
-    return jsonify({
+    return json_response({
         'current_path': path,
         'parent_path': os.path.dirname(path) if path != os.sep else None,
         'breadcrumbs': breadcrumbs,
-        'directories': directories,
-        'files': files,
+        # Parallel arrays (one list per field) instead of one object per entry
+        'directories': {
+            'names': [d[1] for d in directories],
+            'paths': [d[2] for d in directories]
+        },
+        'files': {
+            'names': [f[1] for f in files],
+            'paths': [f[2] for f in files],
+            'sizes': [f[3] for f in files]
+        },
         'total_directories': len(directories),
         'total_files': len(files)
     })
@@ -557,21 +1053,23 @@ def manage_favorites():
     """Manage favorite/pinned paths."""
     if request.method == 'GET':
         favorites = load_favorites()
-        return jsonify(favorites)
+        return json_response(favorites)
     
     elif request.method == 'POST':
-        data = request.json
+        data = request_json()
         path = data.get('path', '').strip()
         
         if not path:
-            return jsonify({'error': 'Path is required'}), 400
+            return json_response({'error': 'Path is required'}, 400)
         
         # Expand and validate path
         path = os.path.expanduser(path)
         path = os.path.abspath(path)
         
-        if not os.path.exists(path):
-            return jsonify({'error': f'Path does not exist: {path}'}), 400
+        try:
+            os.stat(path)
+        except OSError:
+            return json_response({'error': f'Path does not exist: {path}'}, 400)
         
         favorites = load_favorites()
         paths = favorites.get('paths', [])
@@ -581,13 +1079,13 @@ def manage_favorites():
             favorites['paths'] = paths
             save_favorites(favorites)
         
-        return jsonify({'success': True, 'path': path})
+        return json_response({'success': True, 'path': path})
     
     else:  # DELETE
         path = request.args.get('path', '').strip()
         
         if not path:
-            return jsonify({'error': 'Path is required'}), 400
+            return json_response({'error': 'Path is required'}, 400)
         
         # Expand path for comparison
         path = os.path.expanduser(path)
@@ -600,39 +1098,43 @@ def manage_favorites():
             paths.remove(path)
             favorites['paths'] = paths
             save_favorites(favorites)
-            return jsonify({'success': True})
+            return json_response({'success': True})
         else:
-            return jsonify({'error': 'Path not in favorites'}), 404
+            return json_response({'error': 'Path not in favorites'}, 404)
 
 @app.route('/api/parse-script', methods=['POST'])
 def parse_script():
     """Parse argparse arguments from a Python script."""
-    data = request.json
+    data = request_json()
     script_path = data.get('script_path')
     
     if not script_path:
-        return jsonify({'error': 'Script path is required'}), 400
+        return json_response({'error': 'Script path is required'}, 400)
     
     # Expand user path and make absolute
     script_path = os.path.expanduser(script_path)
     script_path = os.path.abspath(script_path)
     
-    if not os.path.exists(script_path):
-        return jsonify({'error': f'Script not found: {script_path}'}), 400
+    try:
+        st = os.stat(script_path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        return json_response({'error': f'Script not found: {script_path}'}, 400)
     
     if not script_path.endswith('.py'):
-        return jsonify({'error': 'File must be a Python script (.py)'}), 400
+        return json_response({'error': 'File must be a Python script (.py)'}, 400)
     
     try:
-        args = parse_argparse_from_file(script_path)
-        return jsonify({'args': args, 'script_path': script_path})
+        args, _ = _cached_parse(script_path, st.st_mtime_ns, st.st_size)
+        return json_response({'args': args, 'script_path': script_path})
     except Exception as e:
-        return jsonify({'error': str(e)}), 400
+        return json_response({'error': str(e)}, 400)
 
 @app.route('/api/run-command', methods=['POST'])
 def run_command():
     """Execute a command in byobu."""
-    data = request.json
+    data = request_json()
     script_path = data.get('script_path')
     args_dict = data.get('args', {})
     pre_command = data.get('pre_command', DEFAULT_ENV_SCRIPT)
@@ -642,7 +1144,7 @@ def run_command():
     save_logs = data.get('save_logs', False)
     
     if not script_path:
-        return jsonify({'error': 'Script path required'}), 400
+        return json_response({'error': 'Script path required'}, 400)
     
     # Determine log directory: use provided, or default if save_logs is True but no dir given
     if save_logs:
@@ -670,28 +1172,14 @@ def run_command():
             'timestamp': datetime.now().isoformat(),
             'command': command
         }
-        
-        history = []
-        if os.path.exists(HISTORY_FILE):
-            try:
-                with open(HISTORY_FILE, 'r') as f:
-                    history = json.load(f)
-            except:
-                pass
-        
-        history.insert(0, history_entry)
-        # Keep only last 50 entries
-        history = history[:50]
-        
-        with open(HISTORY_FILE, 'w') as f:
-            json.dump(history, f, indent=2)
+        append_history(history_entry)
     except Exception as e:
         # Don't fail if history saving fails
         print(f"Warning: Failed to save history: {e}", file=sys.stderr)
     
     result = execute_in_byobu(command, session_name)
     
-    return jsonify(result)
+    return json_response(result)
 
 @app.route('/api/config', methods=['GET', 'POST'])
 def config():
@@ -699,9 +1187,9 @@ def config():
     if request.method == 'GET':
         config = load_config()
         config['default_log_dir'] = DEFAULT_LOG_DIR
-        return jsonify(config)
+        return json_response(config)
     else:
-        config = request.json
+        config = request_json()
         save_config(config)
         global DEFAULT_ENV_SCRIPT, LOG_DIR, LOG_FILE
         DEFAULT_ENV_SCRIPT = config.get('pre_command', None)
@@ -713,44 +1201,148 @@ def config():
         else:
             LOG_DIR = None
             LOG_FILE = None
-        return jsonify({'success': True})
+        return json_response({'success': True})
+
+# Anything but letters, digits, spaces, '-' and '_' is dropped from saved names
+_SANITIZE_RE = re.compile(r'[^\w \-]')
+
+def sanitize_name(name):
+    """Turn a user-supplied config/preset name into a safe file name stem."""
+    return _SANITIZE_RE.sub('', name).strip().replace(' ', '_')
+
+# Directory listings served by GET /api/configs and /api/presets/args. Each is
+# rebuilt only when its directory's mtime changes; saves go through os.replace()
+# and deletes unlink, both of which bump it. Writes also invalidate explicitly.
+_LISTING_CACHES = {}  # directory -> {'mtime_ns': int, 'data': list}
+_LISTING_GENERATIONS = {}  # directory -> count of writes through invalidate_listing()
+
+def listing_response(directory, key, iter_items):
+    """
+    Respond with {key: [...]} for a directory listing. A cached listing is sent
+    as-is while the directory is unchanged; otherwise the items are streamed as
+    iter_items() reads them and the completed list is cached.
+    """
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except FileNotFoundError:
+        return json_response({key: []})
+    # The generation covers writes landing within one mtime tick of each other
+    etag = f'{mtime_ns:x}-{_LISTING_GENERATIONS.get(directory, 0):x}'
+    response = not_modified(etag)
+    if response is not None:
+        return response
+    cache = _LISTING_CACHES.get(directory)
+    if cache is not None and cache['mtime_ns'] == mtime_ns:
+        return with_etag(json_response({key: cache['data']}), etag)
+    
+    def generate():
+        items = []
+        yield b'{"' + key.encode() + b'":['
+        for item in iter_items():
+            yield (b',' if items else b'') + json_dumps(item)
+            items.append(item)
+        yield b']}'
+        _LISTING_CACHES[directory] = {'mtime_ns': mtime_ns, 'data': items}
+    
+    return with_etag(app.response_class(generate(), mimetype='application/json'), etag)
+
+def invalidate_listing(directory, safe_name):
+    """Drop cached listing state after <safe_name>.json in directory is written or removed."""
+    _LISTING_GENERATIONS[directory] = _LISTING_GENERATIONS.get(directory, 0) + 1
+    _LISTING_CACHES.pop(directory, None)
+    _LISTING_FILES.get(directory, {}).pop(f'{safe_name}.json', None)
+
+# Recently missed (directory, name) lookups, so a UI re-requesting a missing
+# config or preset gets its 404 without touching the filesystem
+MISSING_CACHE_TTL = 2.0  # seconds
+MISSING_CACHE_SIZE = 256
+_MISSING_CACHE = {}  # (directory, safe_name) -> expiry time (time.monotonic())
+
+def known_missing(directory, safe_name):
+    """Return True if <safe_name>.json in directory was found missing within MISSING_CACHE_TTL."""
+    key = (directory, safe_name)
+    expires = _MISSING_CACHE.get(key)
+    if expires is None:
+        return False
+    if time.monotonic() < expires:
+        return True
+    _MISSING_CACHE.pop(key, None)
+    return False
+
+def remember_missing(directory, safe_name):
+    """Record that <safe_name>.json does not exist in directory."""
+    if len(_MISSING_CACHE) >= MISSING_CACHE_SIZE:
+        _MISSING_CACHE.pop(next(iter(_MISSING_CACHE)), None)  # Evict the oldest miss
+    _MISSING_CACHE[(directory, safe_name)] = time.monotonic() + MISSING_CACHE_TTL
+
+def forget_missing(directory, safe_name):
+    """Clear a cached miss after <safe_name>.json is written or removed."""
+    _MISSING_CACHE.pop((directory, safe_name), None)
+
+# Per-file summaries from the last listing scan, so unchanged files are not reopened
+_LISTING_FILES = {}  # directory -> {filename: ((st_mtime_ns, st_size), summary)}
+
+def iter_json_summaries(directory, summarize):
+    """
+    Yield summarize(name, data) for every readable <name>.json in directory.
+    Files whose mtime and size match the previous scan reuse their summary.
+    """
+    previous = _LISTING_FILES.get(directory, {})
+    current = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.json') or not entry.is_file():
+                continue
+            try:
+                st = entry.stat()
+                signature = (st.st_mtime_ns, st.st_size)
+                cached = previous.get(entry.name)
+                if cached is not None and cached[0] == signature:
+                    summary = cached[1]
+                else:
+                    with open(entry.path, 'rb') as f:
+                        summary = summarize(entry.name[:-5], json_loads(f.read()))  # Remove .json extension
+            except:
+                continue
+            current[entry.name] = (signature, summary)
+            yield summary
+    _LISTING_FILES[directory] = current
+
+def iter_configs_listing():
+    """Yield the summary of every saved named config."""
+    return iter_json_summaries(CONFIGS_DIR, lambda name, config_data: {
+        'name': name,
+        'pre_command': config_data.get('pre_command'),
+        'byobu_session': config_data.get('byobu_session'),
+        'log_dir': config_data.get('log_dir')
+    })
+
+def iter_presets_listing():
+    """Yield the summary of every saved argument preset."""
+    return iter_json_summaries(ARGS_PRESETS_DIR, lambda name, preset_data: {
+        'name': name,
+        'script_path': preset_data.get('script_path'),
+        'created': preset_data.get('created')
+    })
 
 @app.route('/api/configs', methods=['GET', 'POST', 'DELETE'])
 def configs():
     """Manage named configurations."""
     if request.method == 'GET':
         # List all saved configs
-        configs_list = []
-        if os.path.exists(CONFIGS_DIR):
-            for filename in os.listdir(CONFIGS_DIR):
-                if filename.endswith('.json'):
-                    config_name = filename[:-5]  # Remove .json extension
-                    config_path = os.path.join(CONFIGS_DIR, filename)
-                    try:
-                        with open(config_path, 'r') as f:
-                            config_data = json.load(f)
-                            configs_list.append({
-                                'name': config_name,
-                                'pre_command': config_data.get('pre_command'),
-                                'byobu_session': config_data.get('byobu_session'),
-                                'log_dir': config_data.get('log_dir')
-                            })
-                    except:
-                        pass
-        return jsonify({'configs': configs_list})
+        return listing_response(CONFIGS_DIR, 'configs', iter_configs_listing)
     
     elif request.method == 'POST':
         # Save a named config
-        data = request.json
+        data = request_json()
         config_name = data.get('name', '').strip()
         if not config_name:
-            return jsonify({'error': 'Config name is required'}), 400
+            return json_response({'error': 'Config name is required'}, 400)
         
         # Sanitize filename
-        safe_name = "".join(c for c in config_name if c.isalnum() or c in (' ', '-', '_')).strip()
-        safe_name = safe_name.replace(' ', '_')
+        safe_name = sanitize_name(config_name)
         if not safe_name:
-            return jsonify({'error': 'Invalid config name'}), 400
+            return json_response({'error': 'Invalid config name'}, 400)
         
         config_data = {
             'pre_command': data.get('pre_command'),
@@ -759,76 +1351,68 @@ def configs():
         }
         
         config_path = os.path.join(CONFIGS_DIR, f'{safe_name}.json')
-        with open(config_path, 'w') as f:
-            json.dump(config_data, f, indent=2)
+        write_json_file(config_path, config_data)
+        invalidate_listing(CONFIGS_DIR, safe_name)
+        forget_missing(CONFIGS_DIR, safe_name)
         
-        return jsonify({'success': True, 'name': safe_name})
+        return json_response({'success': True, 'name': safe_name})
     
     else:  # DELETE
         config_name = request.args.get('name', '').strip()
         if not config_name:
-            return jsonify({'error': 'Config name is required'}), 400
+            return json_response({'error': 'Config name is required'}, 400)
         
         # Sanitize filename
-        safe_name = "".join(c for c in config_name if c.isalnum() or c in (' ', '-', '_')).strip()
-        safe_name = safe_name.replace(' ', '_')
+        safe_name = sanitize_name(config_name)
         
         config_path = os.path.join(CONFIGS_DIR, f'{safe_name}.json')
-        if os.path.exists(config_path):
-            os.remove(config_path)
-            return jsonify({'success': True})
-        else:
-            return jsonify({'error': 'Config not found'}), 404
+        if not known_missing(CONFIGS_DIR, safe_name):
+            try:
+                os.remove(config_path)
+            except FileNotFoundError:
+                remember_missing(CONFIGS_DIR, safe_name)
+            else:
+                invalidate_listing(CONFIGS_DIR, safe_name)
+                return json_response({'success': True})
+        return json_response({'error': 'Config not found'}, 404)
 
 @app.route('/api/configs/<config_name>', methods=['GET'])
 def get_config(config_name):
     """Get a specific named configuration."""
-    safe_name = "".join(c for c in config_name if c.isalnum() or c in (' ', '-', '_')).strip()
-    safe_name = safe_name.replace(' ', '_')
+    safe_name = sanitize_name(config_name)
     config_path = os.path.join(CONFIGS_DIR, f'{safe_name}.json')
     
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            config_data = json.load(f)
-        return jsonify(config_data)
-    else:
-        return jsonify({'error': 'Config not found'}), 404
+    if not known_missing(CONFIGS_DIR, safe_name):
+        try:
+            with open(config_path, 'rb') as f:
+                etag = stat_etag(os.fstat(f.fileno()))
+                response = not_modified(etag)
+                if response is not None:
+                    return response
+                config_data = json_loads(f.read())
+            return with_etag(json_response(config_data), etag)
+        except FileNotFoundError:
+            remember_missing(CONFIGS_DIR, safe_name)
+    return json_response({'error': 'Config not found'}, 404)
 
 @app.route('/api/presets/args', methods=['GET', 'POST'])
 def arg_presets():
     """Manage argument presets."""
     if request.method == 'GET':
         # List all argument presets
-        presets_list = []
-        if os.path.exists(ARGS_PRESETS_DIR):
-            for filename in os.listdir(ARGS_PRESETS_DIR):
-                if filename.endswith('.json'):
-                    preset_name = filename[:-5]
-                    preset_path = os.path.join(ARGS_PRESETS_DIR, filename)
-                    try:
-                        with open(preset_path, 'r') as f:
-                            preset_data = json.load(f)
-                            presets_list.append({
-                                'name': preset_name,
-                                'script_path': preset_data.get('script_path'),
-                                'created': preset_data.get('created')
-                            })
-                    except:
-                        pass
-        return jsonify({'presets': presets_list})
+        return listing_response(ARGS_PRESETS_DIR, 'presets', iter_presets_listing)
     
     else:  # POST
         # Save an argument preset
-        data = request.json
+        data = request_json()
         preset_name = data.get('name', '').strip()
         if not preset_name:
-            return jsonify({'error': 'Preset name is required'}), 400
+            return json_response({'error': 'Preset name is required'}, 400)
         
         # Sanitize filename
-        safe_name = "".join(c for c in preset_name if c.isalnum() or c in (' ', '-', '_')).strip()
-        safe_name = safe_name.replace(' ', '_')
+        safe_name = sanitize_name(preset_name)
         if not safe_name:
-            return jsonify({'error': 'Invalid preset name'}), 400
+            return json_response({'error': 'Invalid preset name'}, 400)
         
         preset_data = {
             'name': preset_name,
@@ -838,96 +1422,140 @@ def arg_presets():
         }
         
         preset_path = os.path.join(ARGS_PRESETS_DIR, f'{safe_name}.json')
-        with open(preset_path, 'w') as f:
-            json.dump(preset_data, f, indent=2)
+        write_json_file(preset_path, preset_data)
+        invalidate_listing(ARGS_PRESETS_DIR, safe_name)
+        forget_missing(ARGS_PRESETS_DIR, safe_name)
         
-        return jsonify({'success': True, 'name': safe_name})
+        return json_response({'success': True, 'name': safe_name})
 
 @app.route('/api/presets/args/<preset_name>', methods=['GET'])
 def get_arg_preset(preset_name):
     """Get a specific argument preset."""
-    safe_name = "".join(c for c in preset_name if c.isalnum() or c in (' ', '-', '_')).strip()
-    safe_name = safe_name.replace(' ', '_')
+    safe_name = sanitize_name(preset_name)
     preset_path = os.path.join(ARGS_PRESETS_DIR, f'{safe_name}.json')
     
-    if os.path.exists(preset_path):
-        with open(preset_path, 'r') as f:
-            preset_data = json.load(f)
-        return jsonify(preset_data)
-    else:
-        return jsonify({'error': 'Preset not found'}), 404
+    if not known_missing(ARGS_PRESETS_DIR, safe_name):
+        try:
+            with open(preset_path, 'rb') as f:
+                etag = stat_etag(os.fstat(f.fileno()))
+                response = not_modified(etag)
+                if response is not None:
+                    return response
+                preset_data = json_loads(f.read())
+            return with_etag(json_response(preset_data), etag)
+        except FileNotFoundError:
+            remember_missing(ARGS_PRESETS_DIR, safe_name)
+    return json_response({'error': 'Preset not found'}, 404)
 
 @app.route('/api/history', methods=['GET'])
 def get_history():
     """Get command history."""
-    if os.path.exists(HISTORY_FILE):
-        try:
-            with open(HISTORY_FILE, 'r') as f:
-                history = json.load(f)
-            # Return last 50 entries
-            return jsonify({'history': history[:50]})
-        except:
-            return jsonify({'history': []})
-    return jsonify({'history': []})
+    migrate_legacy_history()
+    try:
+        etag = stat_etag(os.stat(HISTORY_FILE))
+    except FileNotFoundError:
+        return json_response({'history': []})
+    response = not_modified(etag)
+    if response is not None:
+        return response
+    try:
+        # Return last 50 entries, newest first
+        return with_etag(json_response({'history': load_history()}), etag)
+    except:
+        return json_response({'history': []})
 
 @app.route('/api/validate', methods=['POST'])
 def validate():
     """Validate a command before execution."""
-    data = request.json
+    data = request_json()
     script_path = data.get('script_path')
     args_dict = data.get('args', {})
     
     if not script_path:
-        return jsonify({'valid': False, 'error': 'Script path required'}), 400
+        return json_response({'valid': False, 'error': 'Script path required'}, 400)
     
     # Try to parse the script to get required arguments
     try:
-        args = parse_argparse_from_file(script_path)
-        missing_required = [arg for arg in args if arg.get('required') and not args_dict.get(arg['name'].replace('--', ''))]
+        try:
+            st = os.stat(script_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Script not found: {script_path}")
+        _, required = _cached_parse(script_path, st.st_mtime_ns, st.st_size)
+        # Only the required arguments are visited; empty values count as missing
+        missing = [name for key, name in required if not args_dict.get(key)]
         
-        if missing_required:
-            missing = [arg['name'] for arg in missing_required]
-            return jsonify({
+        if missing:
+            return json_response({
                 'valid': False,
                 'error': f"Missing required arguments: {', '.join(missing)}",
                 'missing': missing
             })
         
-        return jsonify({'valid': True})
+        return json_response({'valid': True})
     except Exception as e:
-        return jsonify({'valid': False, 'error': str(e)}), 400
+        return json_response({'valid': False, 'error': str(e)}, 400)
 
 def find_available_port(start_port=5000, max_attempts=10):
     """
     Find an available port starting from start_port.
-    Returns the first available port found.
+    Returns the first available port found. If start_port is 0 or every port in
+    the range is taken, the kernel is asked for any free port instead.
     """
     import socket
 
-    for port in range(start_port, start_port + max_attempts):
-        try:
-            # Try to bind to the port to check if it's available
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+    def probe_socket():
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Must be set before bind() so a port left in TIME_WAIT by a
+        # previous run still counts as available (the server sets it too)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        return s
+
+    try:
+        s = probe_socket()
+    except OSError:
+        return None
+    try:
+        candidates = range(start_port, start_port + max_attempts) if start_port else ()
+        for port in candidates:
+            try:
+                # Try to bind to the port to check if it's available
                 s.bind(('', port))
-                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
                 return port
-        except OSError:
-            continue
+            except OSError as e:
+                # A bind that fails because the port is taken leaves the socket
+                # unbound and reusable; anything else gets a fresh socket
+                if e.errno not in (errno.EADDRINUSE, errno.EACCES):
+                    s.close()
+                    s = probe_socket()
 
-    # If no port found in range, return None
-    return None
+        # Let the kernel pick a free port with a single bind to port 0
+        s.bind(('', 0))
+        return s.getsockname()[1]
+    except OSError:
+        return None
+    finally:
+        s.close()
 
-def start_server_with_retry(host, port, debug, max_attempts=10):
+def start_server_with_retry(host, port, debug, max_attempts=10, dev=False):
     """
-    Start the Flask server, automatically finding an available port if needed.
+    Start the server, automatically finding an available port if needed.
+    Uses waitress with a pool of worker threads when it is installed, or the
+    Flask development server when dev/debug is set or waitress is missing.
     """
+    serve = None
+    if not (dev or debug):
+        try:
+            from waitress import serve
+        except ImportError:
+            print("waitress not installed; falling back to the Flask development server.")
+
     # First, try to find an available port
     available_port = find_available_port(port, max_attempts)
 
     if available_port is None:
         raise RuntimeError(f"Unable to find an available port in range {port}-{port + max_attempts - 1}")
 
-    if available_port != port:
+    if port and available_port != port:
         print(f"Port {port} is in use. Using available port {available_port} instead.")
 
     print(f"\n{'='*60}")
@@ -939,31 +1567,44 @@ def start_server_with_retry(host, port, debug, max_attempts=10):
     print(f"Press Ctrl+C to stop the server.\n")
 
     try:
-        app.run(host=host, port=available_port, debug=debug)
+        # Handle each request on its own thread so a slow browse or byobu call
+        # does not hold up the rest of the UI
+        if serve is not None:
+            serve(app, host=host, port=available_port, threads=8, connection_limit=512)
+        else:
+            app.run(host=host, port=available_port, debug=debug, threaded=True)
     except KeyboardInterrupt:
         print("\n\nServer stopped by user.")
     except Exception as e:
         print(f"\n\nError starting server: {e}")
         raise
 
+@functools.lru_cache(maxsize=None)
+def _build_parser():
+    """Build the command line parser for the server (once per process)."""
+    parser = argparse.ArgumentParser(description='Training Script Runner Web Server')
+    parser.add_argument('--host', default='127.0.0.1', help='Host to bind to')
+    parser.add_argument('--port', type=int, default=5000, help='Port to bind to')
+    parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    parser.add_argument('--dev', action='store_true', help='Use the Flask development server instead of waitress')
+    return parser
+
+@functools.lru_cache(maxsize=None)
+def _configure_logging():
+    """Suppress Flask development server warning for this development tool (once per process)."""
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
 if __name__ == '__main__':
     # Load config on startup
     load_config()
     
     # Parse command line arguments for the server
-    parser = argparse.ArgumentParser(description='Training Script Runner Web Server')
-    parser.add_argument('--host', default='127.0.0.1', help='Host to bind to')
-    parser.add_argument('--port', type=int, default=5000, help='Port to bind to')
-    parser.add_argument('--debug', action='store_true', help='Enable debug mode')
-    args = parser.parse_args()
+    args = _build_parser().parse_args()
 
-    # Suppress Flask development server warning for this development tool
-    import logging
-    log = logging.getLogger('werkzeug')
-    log.setLevel(logging.ERROR)
+    _configure_logging()
 
     try:
-        start_server_with_retry(args.host, args.port, args.debug)
+        start_server_with_retry(args.host, args.port, args.debug, dev=args.dev)
     except Exception as e:
         print(f"Failed to start the server: {e}", file=sys.stderr)
         sys.exit(1)
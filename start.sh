@@ -10,13 +10,17 @@ if command -v python3 &> /dev/null; then
 elif command -v python &> /dev/null; then
     PYTHON_CMD="python"
 else
-    echo "Error: Python not found. Please install Python 3.7 or later."
+    echo "Error: Python not found. Please install Python 3.8 or later."
     exit 1
 fi
 
 # Check Python version
 PYTHON_VERSION=$($PYTHON_CMD --version 2>&1 | awk '{print $2}')
 echo "Using $PYTHON_CMD ($PYTHON_VERSION)"
+if ! $PYTHON_CMD -c "import sys; sys.exit(sys.version_info < (3, 8))" 2>/dev/null; then
+    echo "Error: Python 3.8 or later is required (found $PYTHON_VERSION)."
+    exit 1
+fi
 
 # Check if Flask is installed
 if ! $PYTHON_CMD -c "import flask" 2>/dev/null; then
@@ -30,6 +34,24 @@ if ! $PYTHON_CMD -c "import flask_cors" 2>/dev/null; then
     $PYTHON_CMD -m pip install flask-cors
 fi
 
+# Check if orjson is installed
+if ! $PYTHON_CMD -c "import orjson" 2>/dev/null; then
+    echo "orjson not found. Installing..."
+    $PYTHON_CMD -m pip install orjson
+fi
+
+# Check if msgspec is installed
+if ! $PYTHON_CMD -c "import msgspec" 2>/dev/null; then
+    echo "msgspec not found. Installing..."
+    $PYTHON_CMD -m pip install msgspec
+fi
+
+# Check if waitress is installed
+if ! $PYTHON_CMD -c "import waitress" 2>/dev/null; then
+    echo "waitress not found. Installing..."
+    $PYTHON_CMD -m pip install waitress
+fi
+
 # Start the server
 HOST="${HOST:-127.0.0.1}"
 
@@ -944,6 +944,17 @@ async function loadArgumentPreset() {
 }
 
 // Update Preview
+// Same rules as Python's shlex.quote(): leave safe words bare, otherwise single-quote
+function shellQuote(value) {
+    if (value === '') {
+        return "''";
+    }
+    if (!/[^\w@%+=:,./-]/.test(value)) {
+        return value;
+    }
+    return "'" + value.replace(/'/g, "'\"'\"'") + "'";
+}
+
 function updatePreview() {
     if (!currentScriptPath) {
         document.getElementById('command-preview').textContent = '';
@@ -971,16 +982,15 @@ function updatePreview() {
         }
     }
 
-    preview += `python ${currentScriptPath}`;
+    // Quote exactly like the server's shlex.join so the preview matches what runs
+    preview += `python ${shellQuote(currentScriptPath)}`;
 
     Object.entries(args).forEach(([key, value]) => {
         if (value !== null && value !== undefined && value !== '') {
             if (typeof value === 'boolean') {
-                preview += ` --${key}`;
-            } else if (typeof value === 'string' && (value.includes(' ') || value.includes("'"))) {
-                preview += ` --${key} "${value}"`;
+                preview += ` ${shellQuote(`--${key}`)}`;
             } else {
-                preview += ` --${key} ${value}`;
+                preview += ` ${shellQuote(`--${key}`)} ${shellQuote(String(value))}`;
             }
         }
     });
@@ -1415,17 +1425,20 @@ async function loadDirectory(path) {
 
         listEl.innerHTML = '';
 
-        data.directories.forEach(dir => {
-            listEl.appendChild(createFileItem(dir, 'directory'));
+        // Entries arrive as parallel arrays (names/paths/sizes)
+        const dirs = data.directories;
+        dirs.names.forEach((name, i) => {
+            listEl.appendChild(createFileItem({ name, path: dirs.paths[i] }, 'directory'));
         });
 
-        data.files.forEach(file => {
-            listEl.appendChild(createFileItem(file, 'file'));
+        const files = data.files;
+        files.names.forEach((name, i) => {
+            listEl.appendChild(createFileItem({ name, path: files.paths[i], size: files.sizes[i] }, 'file'));
         });
 
         loadingEl.style.display = 'none';
 
-        if (data.directories.length === 0 && data.files.length === 0) {
+        if (data.total_directories === 0 && data.total_files === 0) {
             emptyEl.style.display = 'block';
         } else {
             listEl.style.display = 'flex';